@@ -34,16 +34,21 @@ class Settings(BaseSettings):
 
     # Database Connection settings
     DB_ECHO: bool = False
-    DB_POOL_SIZE: int = 5
+    DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 3600  # Recycle connections after an hour
 
     # Application Config
     DEBUG: bool = True
     HOST: str = "0.0.0.0"
     PORT: int = 8000
 
+    # Template Config
+    # Re-check template mtimes per render; defaults to DEBUG when unset
+    TEMPLATES_AUTO_RELOAD: bool | None = None
+
     # Security Config
     SECRET_KEY: str = DEFAULT_SECRET_KEY
     SESSION_SIGNING_KEY: str | None = None  # Derived from SECRET_KEY
@@ -94,6 +99,8 @@ class Settings(BaseSettings):
             self.DATABASE_TYPE = self._detect_database_type()  # pylint: disable=C0103
         if not self.SESSION_SIGNING_KEY:
             self.SESSION_SIGNING_KEY = self._derive_session_signing_key()  # pylint: disable=C0103
+        if self.TEMPLATES_AUTO_RELOAD is None:
+            self.TEMPLATES_AUTO_RELOAD = self.DEBUG  # pylint: disable=C0103
         return self
 
     def _derive_session_signing_key(self) -> str:
@@ -144,16 +151,21 @@ class Settings(BaseSettings):
 
     def get_database_config(self) -> dict:
         """Get the database specific configuration"""
-        base_config = {"echo": self.DB_ECHO or self.DEBUG}
+        base_config = {
+            "echo": self.DB_ECHO or self.DEBUG,
+            # Default pool (size 5) head-of-line blocks FastAPI workers under
+            # concurrency; size the pool for both backends
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+        }
         if self.DATABASE_TYPE == "sqlite":
             base_config.update({"connect_args": {"check_same_thread": False}})
         elif self.DATABASE_TYPE == "postgresql":
             base_config.update(
                 {
-                    "pool_size": self.DB_POOL_SIZE,
-                    "max_overflow": self.DB_MAX_OVERFLOW,
-                    "pool_timeout": self.DB_POOL_TIMEOUT,
                     "pool_pre_ping": self.DB_POOL_PRE_PING,
+                    "pool_recycle": self.DB_POOL_RECYCLE,
                 }
             )
         return base_config
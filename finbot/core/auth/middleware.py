@@ -2,6 +2,7 @@
 
 import hashlib
 import logging
+from contextvars import ContextVar
 
 from fastapi import HTTPException, Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -15,6 +16,17 @@ from finbot.core.utils import create_fingerprint_data
 
 logger = logging.getLogger(__name__)
 
+# Session context for the active request - lets internal call chains
+# (e.g. repositories) resolve the context without re-injection plumbing
+_session_context_var: ContextVar[SessionContext | None] = ContextVar(
+    "session_context", default=None
+)
+
+
+def current_session_context() -> SessionContext | None:
+    """Get the session context of the request being processed, if any"""
+    return _session_context_var.get()
+
 
 class SessionMiddleware(BaseHTTPMiddleware):
     """Middleware that automatically handles session cookies and rotation"""
@@ -27,7 +39,11 @@ class SessionMiddleware(BaseHTTPMiddleware):
         request.state.session_status = status
 
         # Process request
-        response = await call_next(request)
+        token = _session_context_var.set(session_context)
+        try:
+            response = await call_next(request)
+        finally:
+            _session_context_var.reset(token)
 
         if (
             session_context.needs_cookie_update
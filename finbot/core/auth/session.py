@@ -46,6 +46,9 @@ class SessionContext:
     csrf_token: str = ""
 
     # Vendor Context
+    # Materialized once per request by SessionManager.load_vendor_context;
+    # reads below (available_vendors, is_multi_vendor_user, ...) are plain
+    # attribute/len lookups and must stay free of DB access.
     current_vendor_id: int | None = None
     current_vendor: dict | None = None
     available_vendors: list[dict] = field(default_factory=list)
@@ -266,10 +269,12 @@ class SessionManager:
                 else:
                     user.last_login = session_context.created_at
 
-            # prepare session data
+            # prepare session data - stored natively as JSON; the signature
+            # is computed over the canonical (sorted-keys) serialization
             session_data = session_context.to_dict()
-            session_data_json = json.dumps(session_data, sort_keys=True)
-            signature = self._sign_session_data(session_data_json)
+            signature = self._sign_session_data(
+                json.dumps(session_data, sort_keys=True)
+            )
 
             session = UserSession(
                 session_id=session_context.session_id,
@@ -277,7 +282,7 @@ class SessionManager:
                 email=session_context.email,
                 is_temporary=session_context.is_temporary,
                 namespace=session_context.namespace,
-                session_data=session_data_json,
+                session_data=session_data,
                 signature=signature,
                 created_at=session_context.created_at,
                 last_accessed=session_context.created_at,
@@ -348,15 +353,15 @@ class SessionManager:
                 db.commit()
                 return None, "session_expired"
 
-            # verify signature
+            # verify signature against the canonical serialization
+            session_data = session.session_data
             if not self._verify_session_signature(
-                session.session_data, session.signature
+                json.dumps(session_data, sort_keys=True), session.signature
             ):
                 db.delete(session)
                 db.commit()
                 return None, "session_tampered"
 
-            session_data = json.loads(session.session_data)
             csrf_token = session_data.get("csrf_token")
 
             # Handle missing CSRF token (should not happen in normal operation)
@@ -366,10 +371,13 @@ class SessionManager:
                     session_id[:8],
                 )
                 csrf_token = secrets.token_urlsafe(32)
-                # Update session data with new CSRF token
-                session_data["csrf_token"] = csrf_token
-                session.session_data = json.dumps(session_data, sort_keys=True)
-                session.signature = self._sign_session_data(session.session_data)
+                # Update session data with new CSRF token (reassign so the
+                # JSON column change is tracked)
+                session_data = {**session_data, "csrf_token": csrf_token}
+                session.session_data = session_data
+                session.signature = self._sign_session_data(
+                    json.dumps(session_data, sort_keys=True)
+                )
 
             session_context = SessionContext(
                 session_id=session.session_id,
@@ -610,7 +618,9 @@ class SessionManager:
             from finbot.core.data.repositories import VendorRepository
 
             vendor_repo = VendorRepository(db, session_context)
-            vendors = vendor_repo.list_vendors() or []
+            # Vendor switching needs the complete set - a page-sized
+            # default would silently hide vendors past the first page
+            vendors = vendor_repo.list_vendors(limit=None) or []
 
             available_vendors = [
                 {
@@ -0,0 +1,71 @@
+"""In-process TTL cache for hot read endpoints"""
+
+import time
+from threading import Lock
+
+
+class TTLCache:
+    """Small thread-safe cache with per-entry expiry
+    - Keys are expected to lead with the namespace so entries can be
+      invalidated per tenant on write paths
+    - Bounded: namespaces are minted per visitor, so one-hit keys would
+      otherwise accumulate for the process lifetime. The TTL is uniform,
+      which keeps the dict in expiry order - eviction pops the front,
+      clearing expired entries before it ever touches live ones
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 4096):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = Lock()
+        self._store: dict = {}
+
+    def get(self, key):
+        """Get a cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._store[key]
+                return None
+            return value
+
+    def set(self, key, value) -> None:
+        """Cache a value until the TTL elapses"""
+        with self._lock:
+            # Drop any existing entry so the re-insert lands at the end,
+            # keeping dict order == expiry order
+            self._store.pop(key, None)
+            while len(self._store) >= self.max_entries:
+                del self._store[next(iter(self._store))]
+            self._store[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, key) -> None:
+        """Drop a single cached entry"""
+        with self._lock:
+            self._store.pop(key, None)
+
+    def invalidate_namespace(self, namespace: str) -> None:
+        """Drop all cached entries for a namespace (tuple keys lead with it)"""
+        with self._lock:
+            stale = [
+                key
+                for key in self._store
+                if key == namespace or (isinstance(key, tuple) and key[0] == namespace)
+            ]
+            for key in stale:
+                del self._store[key]
+
+    def clear(self) -> None:
+        """Drop all cached entries"""
+        with self._lock:
+            self._store.clear()
+
+
+# Shared cache for dashboard metrics responses (short TTL, write-invalidated)
+dashboard_cache = TTLCache(ttl=30)
+
+# Per-namespace vendor counts for the landing-page redirect
+vendor_count_cache = TTLCache(ttl=60)
@@ -0,0 +1,110 @@
+"""Background queue for user activity writes
+- Activity rows are audit data: they never gate a response, so inserting
+  them synchronously only adds commit/fsync latency to every mutating
+  request. Repositories enqueue plain row dicts here and a background
+  task drains them in batches with one multi-row INSERT.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import deque
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert
+
+from finbot.core.data.database import SessionLocal
+from finbot.core.data.models import UserActivity
+
+logger = logging.getLogger(__name__)
+
+# Drain cadence and batch bound for the background task
+FLUSH_INTERVAL = 0.25  # seconds
+FLUSH_BATCH_SIZE = 500
+
+
+class ActivityLogQueue:
+    """Thread-safe in-process queue of pending activity rows"""
+
+    def __init__(self):
+        self._pending: deque[dict] = deque()
+        self._index: dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(row: dict) -> tuple:
+        return (
+            row["namespace"],
+            row["user_id"],
+            row["activity_type"],
+            row["description"],
+        )
+
+    def enqueue(self, row: dict) -> None:
+        """Queue an activity row for the next background flush
+
+        Identical activities still waiting to flush (same namespace, user,
+        type, and description) coalesce into one row with a metadata count
+        rather than stacking duplicates - bulk operations that log the same
+        event repeatedly produce a single audit row.
+        """
+        key = self._key(row)
+        with self._lock:
+            existing = self._index.get(key)
+            if existing is not None:
+                metadata = existing.get("activity_metadata")
+                if not isinstance(metadata, dict):
+                    metadata = {}
+                metadata["count"] = metadata.get("count", 1) + 1
+                existing["activity_metadata"] = metadata
+                return
+            self._pending.append(row)
+            self._index[key] = row
+
+    def flush_now(self) -> int:
+        """Drain up to FLUSH_BATCH_SIZE rows into one INSERT
+
+        Returns the number of rows written; call repeatedly (e.g. on
+        shutdown) until it returns 0 to fully drain the queue.
+        """
+        with self._lock:
+            batch = [
+                self._pending.popleft()
+                for _ in range(min(len(self._pending), FLUSH_BATCH_SIZE))
+            ]
+            for row in batch:
+                self._index.pop(self._key(row), None)
+        if not batch:
+            return 0
+
+        # Metadata stays a dict until this point so requests that never
+        # log anything useful don't pay for serialization
+        for row in batch:
+            metadata = row.get("activity_metadata")
+            if isinstance(metadata, dict):
+                row["activity_metadata"] = json.dumps(metadata)
+
+        session = SessionLocal()
+        try:
+            session.execute(insert(UserActivity), batch)
+            session.commit()
+        except Exception:  # pylint: disable=broad-exception-caught
+            session.rollback()
+            logger.exception("Failed to flush %d activity rows", len(batch))
+        finally:
+            session.close()
+
+        return len(batch)
+
+    async def run(self) -> None:
+        """Periodic drain loop; spawn as an asyncio task at startup"""
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            # The INSERT is blocking (sync SQLAlchemy) - keep it off the
+            # event loop
+            await run_in_threadpool(self.flush_now)
+
+
+# Process-wide queue shared by all repositories
+activity_queue = ActivityLogQueue()
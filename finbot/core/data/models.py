@@ -1,8 +1,10 @@
 """FinBot Data Models"""
 
+import json
 from datetime import UTC, datetime
 
 from sqlalchemy import (
+    JSON,
     Boolean,
     Column,
     DateTime,
@@ -12,12 +14,20 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    event,
+    func,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from finbot.core.data.database import Base
 
 
+def utcnow() -> datetime:
+    """Column default: current UTC time, evaluated per row (not at import)"""
+    return datetime.now(UTC)
+
+
 class User(Base):
     """User Model"""
 
@@ -29,7 +39,7 @@ class User(Base):
     display_name = Column(String(100), nullable=True)
     namespace = Column(String(64), nullable=False, index=True)
 
-    created_at = Column(DateTime, default=datetime.now(UTC), nullable=False)
+    created_at = Column(DateTime, default=utcnow, server_default=func.now(), nullable=False)
     last_login = Column(DateTime, nullable=True)
     is_active = Column(Boolean, default=True)
 
@@ -59,11 +69,12 @@ class UserSession(Base):
     email = Column(String(255), nullable=True, index=True)
     is_temporary = Column(Boolean, default=True)
 
-    # Session data
-    session_data = Column(Text, nullable=False)  # JSON
+    # Session data - native JSONB on Postgres, plain JSON elsewhere, so the
+    # DB decodes once instead of json.loads on every authenticated request
+    session_data = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)
     signature = Column(String(64), nullable=False)  # HMAC signature
     user_agent = Column(String(500), nullable=True)
-    last_rotation = Column(DateTime, default=datetime.now(UTC))
+    last_rotation = Column(DateTime, default=utcnow, server_default=func.now())
     rotation_count = Column(Integer, default=0)
     strict_fingerprint = Column(String(32), nullable=True)
     loose_fingerprint = Column(String(32), nullable=True)
@@ -73,8 +84,8 @@ class UserSession(Base):
         Integer, ForeignKey("vendors.id"), nullable=True, index=True
     )
 
-    created_at = Column(DateTime, default=datetime.now(UTC), nullable=False)
-    last_accessed = Column(DateTime, default=datetime.now(UTC), nullable=False)
+    created_at = Column(DateTime, default=utcnow, server_default=func.now(), nullable=False)
+    last_accessed = Column(DateTime, default=utcnow, server_default=func.now(), nullable=False)
     expires_at = Column(DateTime, nullable=False)
 
     current_vendor = relationship(
@@ -87,6 +98,7 @@ class UserSession(Base):
         Index("idx_user_sessions_expires", "expires_at"),
         Index("idx_user_sessions_rotation", "last_rotation"),
         Index("idx_user_sessions_vendor", "namespace", "current_vendor_id"),
+        Index("idx_user_sessions_data_gin", "session_data", postgresql_using="gin"),
     )
 
     def __repr__(self) -> str:
@@ -146,8 +158,8 @@ class Vendor(Base):
 
     # Metadata
     status = Column(String(50), default="pending")
-    created_at = Column(DateTime, default=datetime.now(UTC))
-    updated_at = Column(DateTime, default=datetime.now(UTC), onupdate=datetime.now(UTC))
+    created_at = Column(DateTime, default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime, default=utcnow, server_default=func.now(), onupdate=func.now())
 
     # relationships
     invoices = relationship("Invoice", back_populates="vendor")
@@ -160,6 +172,8 @@ class Vendor(Base):
     __table_args__ = (
         Index("idx_vendors_namespace", "namespace"),
         Index("idx_vendors_namespace_status", "namespace", "status"),
+        # Covers list_vendors' filter + ORDER BY created_at
+        Index("idx_vendors_namespace_created", "namespace", "created_at"),
         Index("idx_vendors_email", "email"),
         Index("idx_vendors_category", "vendor_category"),
     )
@@ -183,20 +197,32 @@ class Invoice(Base):
     currency = Column(String(3), default="USD")
     description = Column(Text, nullable=True)
     status = Column(String(50), default="pending")
+    due_date = Column(DateTime, nullable=True)
 
     # File information
     pdf_path = Column(String(500), nullable=True)
     extracted_data = Column(Text, nullable=True)  # JSON
 
-    created_at = Column(DateTime, default=datetime.now(UTC))
-    updated_at = Column(DateTime, default=datetime.now(UTC), onupdate=datetime.now(UTC))
+    created_at = Column(DateTime, default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime, default=utcnow, server_default=func.now(), onupdate=func.now())
 
     vendor = relationship("Vendor", back_populates="invoices")
 
     __table_args__ = (
         Index("idx_invoices_namespace", "namespace"),
         Index("idx_invoices_namespace_vendor", "namespace", "vendor_id"),
+        # Covers admin-portal cross-vendor lists (namespace + ORDER BY created_at)
+        Index("idx_invoices_namespace_created", "namespace", "created_at"),
         Index("idx_invoices_namespace_status", "namespace", "status"),
+        # Covers the list endpoint's filter + sort (namespace, vendor, status,
+        # ORDER BY created_at) so it resolves without an in-memory sort
+        Index(
+            "idx_invoices_ns_vendor_status_created",
+            "namespace",
+            "vendor_id",
+            "status",
+            "created_at",
+        ),
     )
 
     def __repr__(self) -> str:
@@ -220,9 +246,23 @@ class UserActivity(Base):
     description = Column(Text, nullable=True)
     activity_metadata = Column(Text, nullable=True)  # JSON
 
-    created_at = Column(DateTime, default=datetime.now(UTC))
+    created_at = Column(DateTime, default=utcnow, server_default=func.now())
     __table_args__ = (
         Index("idx_activities_namespace", "namespace"),
         Index("idx_activities_namespace_user", "namespace", "user_id"),
         Index("idx_activities_namespace_type", "namespace", "activity_type"),
+        Index(
+            "idx_activities_ns_user_created", "namespace", "user_id", "created_at"
+        ),
     )
+
+
+@event.listens_for(UserActivity, "before_insert")
+def _serialize_activity_metadata(mapper, connection, target):
+    """Serialize dict-valued metadata at flush time
+    - Callers can attach the raw dict; rows that never reach a flush
+      (rolled-back requests) skip the json.dumps entirely
+    """
+    _ = mapper, connection
+    if isinstance(target.activity_metadata, dict):
+        target.activity_metadata = json.dumps(target.activity_metadata)
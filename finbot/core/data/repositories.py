@@ -1,19 +1,43 @@
 """Data Repositories for FinBot CTF Platform"""
 
-import json
-from datetime import UTC, datetime
+from datetime import datetime
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.sql import lambda_stmt
 
 from finbot.core.auth.session import SessionContext
+from finbot.core.data.activity_queue import activity_queue
 from finbot.core.data.models import Invoice, UserActivity, Vendor
 
 
+def _vendor_exists(db: Session, namespace: str, vendor_id: int) -> bool:
+    """EXISTS probe for vendor ownership checks
+    - Module-level so cross-model validation doesn't build a second
+      repository or load the vendor row
+    """
+    return bool(
+        db.query(
+            db.query(Vendor.id)
+            .filter(Vendor.id == vendor_id, Vendor.namespace == namespace)
+            .exists()
+        ).scalar()
+    )
+
+
 class NamespacedRepository:
     """Base Repository for automatic isolation and activity logging"""
 
-    def __init__(self, db: Session, session_context: SessionContext):
+    def __init__(self, db: Session, session_context: SessionContext | None = None):
+        if session_context is None:
+            # Fall back to the active request's context set by SessionMiddleware
+            # avoid circular import; pylint: disable=import-outside-toplevel
+            from finbot.core.auth.middleware import current_session_context
+
+            session_context = current_session_context()
+            if session_context is None:
+                raise ValueError("No session context available for repository")
+
         self.db = db
         self.namespace = session_context.namespace
         self.session_context = session_context
@@ -32,31 +56,28 @@ class NamespacedRepository:
         activity_type: str,
         description: str,
         metadata: dict | None = None,
-        commit: bool = False,
-    ) -> UserActivity:
+    ) -> None:
         """Log user activity
 
+        Activity rows are queued and written by the background flush task
+        (see finbot.core.data.activity_queue), keeping audit IO off the
+        request's critical path. Metadata stays a raw dict until flush.
+
         Args:
             activity_type: Type of activity being logged
             description: Human-readable description
             metadata: Optional metadata dictionary
-            commit: Whether to commit immediately (default: False, relies on caller to commit)
         """
-        activity = UserActivity(
-            namespace=self.namespace,
-            user_id=self.session_context.user_id,
-            activity_type=activity_type,
-            description=description,
-            activity_metadata=json.dumps(metadata) if metadata else None,
+        activity_queue.enqueue(
+            {
+                "namespace": self.namespace,
+                "user_id": self.session_context.user_id,
+                "activity_type": activity_type,
+                "description": description,
+                "activity_metadata": metadata,
+            }
         )
 
-        self.db.add(activity)
-        if commit:
-            self.db.commit()
-            self.db.refresh(activity)
-
-        return activity
-
 
 class VendorRepository(NamespacedRepository):
     """Repository for Vendor model"""
@@ -94,8 +115,7 @@ class VendorRepository(NamespacedRepository):
             status="pending",
         )
         self.db.add(vendor)
-        self.db.commit()
-        self.db.refresh(vendor)
+        self.db.flush()  # assign vendor.id without ending the transaction
 
         self.log_activity(
             "vendor_created",
@@ -106,8 +126,9 @@ class VendorRepository(NamespacedRepository):
                 "vendor_category": vendor_category,
                 "industry": industry,
             },
-            commit=True,
         )
+        self.db.commit()
+        self.db.refresh(vendor)
 
         return vendor
 
@@ -117,27 +138,56 @@ class VendorRepository(NamespacedRepository):
             self.db.query(Vendor).filter(Vendor.id == vendor_id), Vendor
         ).first()
 
-    def list_vendors(self, status: str | None = None) -> list[Vendor] | None:
-        """List vendors"""
+    def list_vendors(
+        self,
+        status: str | None = None,
+        include_invoices: bool = False,
+        limit: int | None = 50,
+        cursor: datetime | None = None,
+    ) -> list[Vendor] | None:
+        """List vendors
+        - Pass include_invoices=True when callers will touch vendor.invoices;
+          selectinload fetches them in one extra query instead of one per row
+        - Keyset-paginated: pass the last row's created_at as cursor for the
+          next page; the (namespace, created_at) index serves each page as a
+          range scan. limit=None disables the bound for callers that need
+          the complete set (e.g. loading the vendor-switch context)
+        """
         query = self._add_namespace_filter(self.db.query(Vendor), Vendor)
 
+        if include_invoices:
+            query = query.options(selectinload(Vendor.invoices))
+
         if status:
             query = query.filter(Vendor.status == status)
 
-        return query.order_by(Vendor.created_at.desc()).all()
+        if cursor:
+            query = query.filter(Vendor.created_at < cursor)
+
+        query = query.order_by(Vendor.created_at.desc())
+
+        if limit is not None:
+            query = query.limit(limit)
+
+        return query.all()
 
     def update_vendor(self, vendor_id: int, **updates) -> Vendor | None:
-        """Update vendor"""
-        vendor = self.get_vendor(vendor_id)
-        if not vendor:
-            return None
+        """Update vendor
+        - Direct UPDATE (no prior SELECT); updated_at uses the DB clock
+        """
+        valid_updates = {k: v for k, v in updates.items() if hasattr(Vendor, k)}
 
-        for key, value in updates.items():
-            if hasattr(vendor, key):
-                setattr(vendor, key, value)
+        rowcount = self._add_namespace_filter(
+            self.db.query(Vendor).filter(Vendor.id == vendor_id), Vendor
+        ).update(
+            {**valid_updates, "updated_at": func.now()}, synchronize_session=False
+        )
+        if not rowcount:
+            return None
 
-        vendor.updated_at = datetime.now(UTC)
-        self.db.commit()
+        # Re-select only now that we know the row exists (needed for the
+        # return value and the activity description)
+        vendor = self.get_vendor(vendor_id)
 
         self.log_activity(
             "vendor_updated",
@@ -147,8 +197,8 @@ class VendorRepository(NamespacedRepository):
                 "vendor_name": vendor.company_name,
                 "updates": list(updates.keys()),
             },
-            commit=True,
         )
+        self.db.commit()
 
         return vendor
 
@@ -161,20 +211,27 @@ class VendorRepository(NamespacedRepository):
         vendor_name = vendor.company_name
         vendor_id = vendor.id
         self.db.delete(vendor)
-        self.db.commit()
 
         self.log_activity(
             "vendor_deleted",
             f"Deleted vendor: {vendor_name}",
             metadata={"vendor_id": vendor_id, "vendor_name": vendor_name},
-            commit=True,
         )
+        self.db.commit()
 
         return True
 
     def get_vendor_count(self) -> int:
-        """Get count of vendors"""
-        return self._add_namespace_filter(self.db.query(Vendor), Vendor).count()
+        """Get count of vendors
+        - lambda statement reuses the cached statement construction per call
+        """
+        ns = self.namespace
+        stmt = lambda_stmt(
+            lambda: select(func.count())
+            .select_from(Vendor)
+            .where(Vendor.namespace == ns)
+        )
+        return self.db.execute(stmt).scalar() or 0
 
     def set_current_vendor(self, vendor_id: int) -> bool:
         """Set current vendor for user (all sessions)"""
@@ -183,12 +240,33 @@ class VendorRepository(NamespacedRepository):
         if not vendor:
             return False
 
+        return self._switch_to(vendor)
+
+    def switch_current_vendor(self, vendor_id: int) -> Vendor | None:
+        """Switch current vendor and return it in a single lookup
+        - Callers that need the vendor row (e.g. the switch endpoint) get the
+          validation SELECT and the context update without a second query
+        - Returns None only when the vendor doesn't exist; a failed
+          session-context update raises RuntimeError so callers can keep
+          not-found and internal-failure responses distinct
+        """
+        vendor = self.get_vendor(vendor_id)
+        if not vendor:
+            return None
+
+        if not self._switch_to(vendor):
+            raise RuntimeError(f"Failed to update vendor context to {vendor_id}")
+
+        return vendor
+
+    def _switch_to(self, vendor: Vendor) -> bool:
+        """Point all of the user's sessions at an already-loaded vendor"""
         # Update vendor context globally
         # avoid circular import; pylint: disable=import-outside-toplevel
         from finbot.core.auth.session import session_manager
 
         success = session_manager.update_vendor_context(
-            self.session_context.session_id, vendor_id
+            self.session_context.session_id, vendor.id
         )
 
         if success:
@@ -196,10 +274,9 @@ class VendorRepository(NamespacedRepository):
                 "vendor_switched",
                 f"Switched to vendor: {vendor.company_name}",
                 metadata={
-                    "vendor_id": vendor_id,
+                    "vendor_id": vendor.id,
                     "company_name": vendor.company_name,
                 },
-                commit=True,
             )
 
         return success
@@ -208,25 +285,80 @@ class VendorRepository(NamespacedRepository):
 class InvoiceRepository(NamespacedRepository):
     """Invoice repository - Namespaced to user"""
 
-    def __init__(self, db: Session, session_context: SessionContext):
+    def __init__(self, db: Session, session_context: SessionContext | None = None):
         super().__init__(db, session_context)
-        self.current_vendor_id = session_context.current_vendor_id
+        self.current_vendor_id = self.session_context.current_vendor_id
 
     # Vendor Scoped Methods for Vendor Portal
     def list_invoices_for_current_vendor(
-        self, status: str | None = None
+        self,
+        status: str | None = None,
+        limit: int = 50,
+        cursor: datetime | None = None,
     ) -> list[Invoice]:
-        """Vendor portal: List invoices for current vendor only"""
+        """Vendor portal: List invoices for current vendor only
+        - lambda statement skips re-building the statement on every call;
+          closure variables (ns/vid/status/...) become bound parameters
+        - Keyset-paginated: pass the last row's created_at as cursor for
+          the next page
+        """
         if not self.current_vendor_id:
             raise ValueError("Vendor context required for this operation")
 
-        query = self._add_namespace_filter(self.db.query(Invoice), Invoice)
+        ns = self.namespace
+        vid = self.current_vendor_id
+        stmt = lambda_stmt(
+            lambda: select(Invoice)
+            .where(Invoice.namespace == ns)
+            .where(Invoice.vendor_id == vid)
+        )
+
+        if status:
+            stmt += lambda s: s.where(Invoice.status == status)
+
+        if cursor:
+            stmt += lambda s: s.where(Invoice.created_at < cursor)
+
+        stmt += lambda s: s.order_by(Invoice.created_at.desc()).limit(limit)
+
+        return list(self.db.execute(stmt).scalars())
+
+    def list_invoice_rows_for_current_vendor(
+        self,
+        status: str | None = None,
+        limit: int = 50,
+        cursor: datetime | None = None,
+    ) -> list:
+        """Vendor portal: List invoice rows for current vendor only
+        - Projects only the columns needed for list serialization, skipping
+          ORM materialization and wide columns (pdf_path, extracted_data)
+        - Keyset-paginated: pass the last row's created_at as cursor for
+          the next page
+        """
+        if not self.current_vendor_id:
+            raise ValueError("Vendor context required for this operation")
+
+        query = self._add_namespace_filter(
+            self.db.query(Invoice).with_entities(
+                Invoice.id,
+                Invoice.invoice_number,
+                Invoice.amount,
+                Invoice.status,
+                Invoice.description,
+                Invoice.due_date,
+                Invoice.created_at,
+            ),
+            Invoice,
+        )
         query = query.filter(Invoice.vendor_id == self.current_vendor_id)
 
         if status:
             query = query.filter(Invoice.status == status)
 
-        return query.order_by(Invoice.created_at.desc()).all()
+        if cursor:
+            query = query.filter(Invoice.created_at < cursor)
+
+        return query.order_by(Invoice.created_at.desc()).limit(limit).all()
 
     def create_invoice_for_current_vendor(self, **invoice_data) -> Invoice:
         """Vendor portal: Create invoice for current vendor"""
@@ -238,8 +370,7 @@ class InvoiceRepository(NamespacedRepository):
 
         invoice = Invoice(**invoice_data)
         self.db.add(invoice)
-        self.db.commit()
-        self.db.refresh(invoice)
+        self.db.flush()  # assign invoice.id without ending the transaction
 
         self.log_activity(
             "invoice_created",
@@ -249,47 +380,137 @@ class InvoiceRepository(NamespacedRepository):
                 "vendor_id": self.current_vendor_id,
                 "amount": float(invoice.amount),
             },
-            commit=True,
         )
+        self.db.commit()
+        self.db.refresh(invoice)
 
         return invoice
 
+    def iter_invoice_rows_for_current_vendor(self, status: str | None = None):
+        """Vendor portal: Iterate invoice rows for current vendor
+        - Streams rows from the DB in batches (yield_per) instead of
+          materializing the whole result set; suited to export endpoints
+        """
+        if not self.current_vendor_id:
+            raise ValueError("Vendor context required for this operation")
+
+        query = self._add_namespace_filter(
+            self.db.query(Invoice).with_entities(
+                Invoice.id,
+                Invoice.invoice_number,
+                Invoice.amount,
+                Invoice.status,
+                Invoice.description,
+                Invoice.due_date,
+                Invoice.created_at,
+            ),
+            Invoice,
+        )
+        query = query.filter(Invoice.vendor_id == self.current_vendor_id)
+
+        if status:
+            query = query.filter(Invoice.status == status)
+
+        return query.order_by(Invoice.created_at.desc()).yield_per(1000)
+
+    def create_invoices_bulk(self, invoices: list[dict]) -> list[int]:
+        """Vendor portal: Create many invoices in a single round-trip
+        - One multi-row INSERT ... RETURNING instead of a flush per invoice
+        """
+        if not self.current_vendor_id:
+            raise ValueError("Vendor context required for this operation")
+        if not invoices:
+            raise ValueError("No invoices provided")
+
+        # One EXISTS probe validates the vendor for the whole batch
+        if not _vendor_exists(self.db, self.namespace, self.current_vendor_id):
+            raise ValueError("Vendor not found or access denied")
+
+        rows = [
+            {
+                **invoice_data,
+                "vendor_id": self.current_vendor_id,
+                "namespace": self.namespace,
+            }
+            for invoice_data in invoices
+        ]
+
+        result = self.db.execute(insert(Invoice).returning(Invoice.id), rows)
+        invoice_ids = [row[0] for row in result]
+
+        self.log_activity(
+            "invoices_bulk_created",
+            f"Created {len(invoice_ids)} invoices",
+            metadata={
+                "invoice_ids": invoice_ids,
+                "vendor_id": self.current_vendor_id,
+            },
+        )
+        self.db.commit()
+
+        return invoice_ids
+
     def get_current_vendor_invoice_stats(self) -> dict:
-        """Vendor portal: Get invoice stats for current vendor"""
+        """Vendor portal: Get invoice stats for current vendor
+        - Single GROUP BY aggregate; totals are pivoted in Python
+        """
         if not self.current_vendor_id:
             raise ValueError("Vendor context required for this operation")
 
         query = self._add_namespace_filter(self.db.query(Invoice), Invoice)
         query = query.filter(Invoice.vendor_id == self.current_vendor_id)
 
-        total_count = query.count()
-        total_amount = query.with_entities(func.sum(Invoice.amount)).scalar() or 0
-        paid_count = query.filter(Invoice.status == "paid").count()
-        paid_amount = (
-            query.filter(Invoice.status == "paid")
-            .with_entities(func.sum(Invoice.amount))
-            .scalar()
-            or 0
+        rows = (
+            query.with_entities(
+                Invoice.status, func.count(Invoice.id), func.sum(Invoice.amount)
+            )
+            .group_by(Invoice.status)
+            .all()
+        )
+
+        total_count = sum(count for _, count, _ in rows)
+        total_amount = float(sum(amount or 0 for _, _, amount in rows))
+        paid_count = sum(count for status, count, _ in rows if status == "paid")
+        paid_amount = float(
+            sum(amount or 0 for status, _, amount in rows if status == "paid")
         )
 
         return {
             "total_count": total_count,
-            "total_amount": float(total_amount),
+            "total_amount": total_amount,
             "paid_count": paid_count,
-            "paid_amount": float(paid_amount),
+            "paid_amount": paid_amount,
             "pending_count": total_count - paid_count,
-            "pending_amount": float(total_amount) - float(paid_amount),
+            "pending_amount": total_amount - paid_amount,
         }
 
     # Admin Portal Methods (cross-vendor within namespace)
-    def list_all_invoices_for_user(self, status: str | None = None) -> list[Invoice]:
-        """Admin portal: List ALL invoices across all user's vendors"""
+    def list_all_invoices_for_user(
+        self,
+        status: str | None = None,
+        eager: bool = True,
+        limit: int = 50,
+        cursor: datetime | None = None,
+    ) -> list[Invoice]:
+        """Admin portal: List ALL invoices across all user's vendors
+        - Callers render invoice.vendor per row; selectinload fetches all
+          vendors in one extra query instead of a lazy load per invoice.
+          Pass eager=False when the relation won't be touched
+        - Keyset-paginated: pass the last row's created_at as cursor for
+          the next page
+        """
         query = self._add_namespace_filter(self.db.query(Invoice), Invoice)
 
+        if eager:
+            query = query.options(selectinload(Invoice.vendor))
+
         if status:
             query = query.filter(Invoice.status == status)
 
-        return query.order_by(Invoice.created_at.desc()).all()
+        if cursor:
+            query = query.filter(Invoice.created_at < cursor)
+
+        return query.order_by(Invoice.created_at.desc()).limit(limit).all()
 
     def list_invoices_by_vendor(
         self, status: str | None = None
@@ -339,26 +560,33 @@ class InvoiceRepository(NamespacedRepository):
         }
 
     def get_user_invoice_totals(self) -> dict:
-        """Admin portal: Get aggregate invoice totals for user"""
+        """Admin portal: Get aggregate invoice totals for user
+        - Single GROUP BY aggregate; totals are pivoted in Python
+        """
         query = self._add_namespace_filter(self.db.query(Invoice), Invoice)
 
-        total_count = query.count()
-        total_amount = query.with_entities(func.sum(Invoice.amount)).scalar() or 0
-        paid_count = query.filter(Invoice.status == "paid").count()
-        paid_amount = (
-            query.filter(Invoice.status == "paid")
-            .with_entities(func.sum(Invoice.amount))
-            .scalar()
-            or 0
+        rows = (
+            query.with_entities(
+                Invoice.status, func.count(Invoice.id), func.sum(Invoice.amount)
+            )
+            .group_by(Invoice.status)
+            .all()
+        )
+
+        total_count = sum(count for _, count, _ in rows)
+        total_amount = float(sum(amount or 0 for _, _, amount in rows))
+        paid_count = sum(count for status, count, _ in rows if status == "paid")
+        paid_amount = float(
+            sum(amount or 0 for status, _, amount in rows if status == "paid")
         )
 
         return {
             "total_count": total_count,
-            "total_amount": float(total_amount),
+            "total_amount": total_amount,
             "paid_count": paid_count,
-            "paid_amount": float(paid_amount),
+            "paid_amount": paid_amount,
             "pending_count": total_count - paid_count,
-            "pending_amount": float(total_amount) - float(paid_amount),
+            "pending_amount": total_amount - paid_amount,
         }
 
     # Flexible Methods (can be used by both portals)
@@ -366,9 +594,9 @@ class InvoiceRepository(NamespacedRepository):
         self, vendor_id: int, status: str | None = None
     ) -> list[Invoice]:
         """List invoices for specific vendor"""
-        # Validate vendor belongs to user's namespace
-        vendor_repo = VendorRepository(self.db, self.session_context)
-        if not vendor_repo.get_vendor(vendor_id):
+        # Validate vendor belongs to user's namespace with an EXISTS probe
+        # instead of materializing the whole vendor row
+        if not _vendor_exists(self.db, self.namespace, vendor_id):
             raise ValueError("Vendor not found or access denied")
 
         query = self._add_namespace_filter(self.db.query(Invoice), Invoice)
@@ -380,23 +608,33 @@ class InvoiceRepository(NamespacedRepository):
         return query.order_by(Invoice.created_at.desc()).all()
 
     def get_invoice(self, invoice_id: int) -> Invoice | None:
-        """Flexible: Get single invoice (validates namespace, not vendor)"""
-        return self._add_namespace_filter(
-            self.db.query(Invoice).filter(Invoice.id == invoice_id), Invoice
-        ).first()
+        """Flexible: Get single invoice (validates namespace, not vendor)
+        - joinedload pulls the vendor in the same SELECT; for a single row
+          that beats a second lazy-load round-trip
+        """
+        return (
+            self._add_namespace_filter(
+                self.db.query(Invoice).filter(Invoice.id == invoice_id), Invoice
+            )
+            .options(joinedload(Invoice.vendor))
+            .first()
+        )
 
     def update_invoice(self, invoice_id: int, **updates) -> Invoice | None:
-        """Flexible: Update invoice (validates namespace)"""
-        invoice = self.get_invoice(invoice_id)
-        if not invoice:
-            return None
+        """Flexible: Update invoice (validates namespace)
+        - Direct UPDATE (no prior SELECT); updated_at uses the DB clock
+        """
+        valid_updates = {k: v for k, v in updates.items() if hasattr(Invoice, k)}
 
-        for key, value in updates.items():
-            if hasattr(invoice, key):
-                setattr(invoice, key, value)
+        rowcount = self._add_namespace_filter(
+            self.db.query(Invoice).filter(Invoice.id == invoice_id), Invoice
+        ).update(
+            {**valid_updates, "updated_at": func.now()}, synchronize_session=False
+        )
+        if not rowcount:
+            return None
 
-        invoice.updated_at = datetime.now(UTC)
-        self.db.commit()
+        invoice = self.get_invoice(invoice_id)
 
         self.log_activity(
             "invoice_updated",
@@ -406,8 +644,8 @@ class InvoiceRepository(NamespacedRepository):
                 "vendor_id": invoice.vendor_id,
                 "updates": list(updates.keys()),
             },
-            commit=True,
         )
+        self.db.commit()
 
         return invoice
 
@@ -415,43 +653,24 @@ class InvoiceRepository(NamespacedRepository):
 class UserActivityRepository(NamespacedRepository):
     """User activity tracking repository"""
 
-    def log_activity(
-        self,
-        activity_type: str,
-        description: str,
-        metadata: dict | None = None,
-        commit: bool = True,
-    ) -> UserActivity:
-        """Log user activity with immediate commit by default"""
-
-        activity = UserActivity(
-            namespace=self.namespace,
-            user_id=self.session_context.user_id,
-            activity_type=activity_type,
-            description=description,
-            activity_metadata=json.dumps(metadata) if metadata else None,
+    def get_user_activities(
+        self, limit: int = 50, cursor: datetime | None = None
+    ) -> list[UserActivity]:
+        """Get user activities in their namespace
+        - Keyset-paginated: pass the last row's created_at as cursor for
+          the next page
+        """
+        query = self._add_namespace_filter(
+            self.db.query(UserActivity).filter(
+                UserActivity.user_id == self.session_context.user_id
+            ),
+            UserActivity,
         )
 
-        self.db.add(activity)
-        if commit:
-            self.db.commit()
-            self.db.refresh(activity)
+        if cursor:
+            query = query.filter(UserActivity.created_at < cursor)
 
-        return activity
-
-    def get_user_activities(self, limit: int = 50) -> list[UserActivity]:
-        """Get user activities in their namespace"""
-        return (
-            self._add_namespace_filter(
-                self.db.query(UserActivity).filter(
-                    UserActivity.user_id == self.session_context.user_id
-                ),
-                UserActivity,
-            )
-            .order_by(UserActivity.created_at.desc())
-            .limit(limit)
-            .all()
-        )
+        return query.order_by(UserActivity.created_at.desc()).limit(limit).all()
 
     def get_activity_stats(self) -> dict:
         """Get activity statistics for user"""
@@ -462,17 +681,18 @@ class UserActivityRepository(NamespacedRepository):
             UserActivity,
         )
 
-        total_activities = query.count()
-
-        activity_types = {}
-        activity_type_query = (
-            query.with_entities(UserActivity.activity_type)
+        # Single GROUP BY replaces the per-type COUNT loop (and the separate
+        # total count query - the total is the sum of the per-type counts)
+        rows = (
+            query.with_entities(
+                UserActivity.activity_type, func.count(UserActivity.id)
+            )
             .group_by(UserActivity.activity_type)
             .all()
         )
-        for activity_type_result in activity_type_query:
-            activity_type = activity_type_result[0]
-            count = query.filter(UserActivity.activity_type == activity_type).count()
-            activity_types[activity_type] = count
+        activity_types = dict(rows)
 
-        return {"total_activities": total_activities, "activity_types": activity_types}
+        return {
+            "total_activities": sum(activity_types.values()),
+            "activity_types": activity_types,
+        }
@@ -2,7 +2,8 @@
 Error handling utilities and exception handlers for the FinBot platform.
 """
 
-import os
+from functools import lru_cache
+from pathlib import Path
 from typing import Any, Dict
 
 from fastapi import HTTPException, Request
@@ -11,36 +12,68 @@ from fastapi.responses import HTMLResponse, JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 
+# API prefix as bytes: comparing against the ASGI raw_path avoids
+# building the URL object on every error response
+_API_PREFIX = b"/api/"
+
+_ERROR_MESSAGES = {
+    400: "Bad Request",
+    401: "Unauthorized",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    422: "Unprocessable Entity",
+    500: "Internal Server Error",
+    502: "Bad Gateway",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
 def is_api_request(request: Request) -> bool:
     """Determine if the request is for an API endpoint."""
+    raw_path = request.scope.get("raw_path")
+    if raw_path is not None:
+        return raw_path.startswith(_API_PREFIX)
     return request.url.path.startswith("/api/")
 
 
+@lru_cache(maxsize=None)
+def read_static_page(path: str) -> str | None:
+    """Read a static HTML page once and serve it from memory afterwards.
+
+    The page set is fixed at deploy time and totals a few dozen KB, so
+    caching every page for the process lifetime is safe. Returns None if
+    the file is missing (callers keep their inline fallbacks).
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
 def get_json_error_response(status_code: int, detail: str = None) -> Dict[str, Any]:
     """Create a standardized JSON error response."""
-    error_messages = {
-        400: "Bad Request",
-        401: "Unauthorized",
-        403: "Forbidden",
-        404: "Not Found",
-        405: "Method Not Allowed",
-        422: "Unprocessable Entity",
-        500: "Internal Server Error",
-        502: "Bad Gateway",
-        503: "Service Unavailable",
-        504: "Gateway Timeout",
-    }
-
-    message = detail or error_messages.get(status_code, "An error occurred")
+    message = detail or _ERROR_MESSAGES.get(status_code, "An error occurred")
 
     return {"error": {"code": status_code, "message": message, "type": "api_error"}}
 
 
+# Error page set is fixed at deploy time; scan it once at import so
+# get_error_page_path needs no per-request stat() call
+_ERROR_PAGES = {
+    int(page.stem): str(page)
+    for page in Path("finbot/static/pages/error").glob("*.html")
+    if page.stem.isdigit()
+}
+
+
 def get_error_page_path(status_code: int) -> str:
     """Get the path to the error page for a given status code."""
-    error_page = f"finbot/static/pages/error/{status_code}.html"
-    if os.path.exists(error_page):
-        return error_page
+    page = _ERROR_PAGES.get(status_code)
+    if page:
+        return page
     # Fallback to generic error page based on status code range
     if 400 <= status_code < 500:
         return "finbot/static/pages/error/400.html"
@@ -50,6 +83,29 @@ def get_error_page_path(status_code: int) -> str:
         return "finbot/static/pages/error/404.html"
 
 
+def _error_response(
+    request: Request,
+    status_code: int,
+    detail: str = None,
+    fallback_html: str = None,
+):
+    """Shared JSON-or-HTML error response used by every handler."""
+    if is_api_request(request):
+        return JSONResponse(
+            content=get_json_error_response(status_code, detail),
+            status_code=status_code,
+        )
+
+    content = read_static_page(get_error_page_path(status_code))
+    if content is not None:
+        return HTMLResponse(content=content, status_code=status_code)
+    # Fallback to basic error response if error page is missing
+    return HTMLResponse(
+        content=fallback_html or f"<h1>Error {status_code}</h1><p>{detail}</p>",
+        status_code=status_code,
+    )
+
+
 async def fastapi_http_exception_handler(request: Request, exc: HTTPException):
     """Handle FastAPI HTTP exceptions"""
     # Convert FastAPI HTTPException to StarletteHTTPException and reuse handler
@@ -78,37 +134,16 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
             )
         else:
             # For web requests, show a dedicated CSRF error page
-            try:
-                with open(
-                    "finbot/static/pages/error/403_csrf.html", "r", encoding="utf-8"
-                ) as f:
-                    content = f.read()
+            content = read_static_page("finbot/static/pages/error/403_csrf.html")
+            if content is not None:
                 return HTMLResponse(content=content, status_code=403)
-            except FileNotFoundError:
-                # Fallback if CSRF error page is missing
-                return HTMLResponse(
-                    content="<h1>403 Forbidden</h1><p>Security validation failed. Please refresh the page and try again.</p>",
-                    status_code=403,
-                )
-
-    # Return JSON response for API requests
-    if is_api_request(request):
-        error_data = get_json_error_response(exc.status_code, exc.detail)
-        return JSONResponse(content=error_data, status_code=exc.status_code)
+            # Fallback if CSRF error page is missing
+            return HTMLResponse(
+                content="<h1>403 Forbidden</h1><p>Security validation failed. Please refresh the page and try again.</p>",
+                status_code=403,
+            )
 
-    # Return HTML response for web requests
-    error_page_path = get_error_page_path(exc.status_code)
-
-    try:
-        with open(error_page_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        return HTMLResponse(content=content, status_code=exc.status_code)
-    except FileNotFoundError:
-        # Fallback to basic error response if error page is missing
-        return HTMLResponse(
-            content=f"<h1>Error {exc.status_code}</h1><p>{exc.detail}</p>",
-            status_code=exc.status_code,
-        )
+    return _error_response(request, exc.status_code, exc.detail)
 
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -137,56 +172,29 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         return JSONResponse(content=error_data, status_code=422)
 
     # Return HTML response for web requests
-    error_page_path = get_error_page_path(400)
-
-    try:
-        with open(error_page_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        return HTMLResponse(content=content, status_code=400)
-    except FileNotFoundError:
-        return HTMLResponse(
-            content="<h1>Error 400</h1><p>Bad Request</p>", status_code=400
-        )
+    return _error_response(
+        request, 400, fallback_html="<h1>Error 400</h1><p>Bad Request</p>"
+    )
 
 
 async def not_found_handler(request: Request, exc: HTTPException):
     """Handle 404 errors with custom error page or JSON response."""
-    # Return JSON response for API requests
-    if is_api_request(request):
-        error_data = get_json_error_response(404, exc.detail)
-        return JSONResponse(content=error_data, status_code=404)
-
-    # Return HTML response for web requests
-    error_page_path = get_error_page_path(404)
-
-    try:
-        with open(error_page_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        return HTMLResponse(content=content, status_code=404)
-    except FileNotFoundError:
-        return HTMLResponse(
-            content="<h1>Error 404</h1><p>Page Not Found</p>", status_code=404
-        )
+    return _error_response(
+        request,
+        404,
+        exc.detail,
+        fallback_html="<h1>Error 404</h1><p>Page Not Found</p>",
+    )
 
 
 async def internal_server_error_handler(request: Request, exc: HTTPException):
     """Handle 500 errors with custom error page or JSON response."""
-    # Return JSON response for API requests
-    if is_api_request(request):
-        error_data = get_json_error_response(500, exc.detail)
-        return JSONResponse(content=error_data, status_code=500)
-
-    # Return HTML response for web requests
-    error_page_path = get_error_page_path(500)
-
-    try:
-        with open(error_page_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        return HTMLResponse(content=content, status_code=500)
-    except FileNotFoundError:
-        return HTMLResponse(
-            content="<h1>Error 500</h1><p>Internal Server Error</p>", status_code=500
-        )
+    return _error_response(
+        request,
+        500,
+        exc.detail,
+        fallback_html="<h1>Error 500</h1><p>Internal Server Error</p>",
+    )
 
 
 def register_error_handlers(app):
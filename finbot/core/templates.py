@@ -1,21 +1,40 @@
 """Template utilities and context processors for FinBot CTF Platform"""
 
+import tempfile
+from pathlib import Path
+
 from fastapi import Request
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 
+from finbot.config import settings
 from finbot.core.auth.csrf import csrf_token_field, csrf_token_meta, get_csrf_token
 
+# Shared on-disk cache for compiled template bytecode - survives worker
+# restarts so cold workers skip the Jinja parse/compile passes. One cache
+# instance serves every template environment (it is keyed by checksum).
+_BYTECODE_CACHE_DIR = Path(tempfile.gettempdir()) / "finbot_jinja_cache"
+_BYTECODE_CACHE_DIR.mkdir(exist_ok=True)
+_BYTECODE_CACHE = FileSystemBytecodeCache(str(_BYTECODE_CACHE_DIR))
 
-def add_csrf_context(request: Request, context: dict) -> dict:
-    """Add CSRF token context to template context"""
-    csrf_context = {
-        "csrf_token": get_csrf_token(request),
-        "csrf_token_field": csrf_token_field(request),
-        "csrf_token_meta": csrf_token_meta(request),
-    }
 
-    # Merge with existing context
-    return {**context, **csrf_context}
+def add_csrf_context(request: Request, context: dict) -> dict:
+    """Add CSRF token context to template context
+    - Tokens are constant for the request, so they are built once and
+      memoized on request.state for any further renders
+    """
+    csrf_context = getattr(request.state, "csrf_context", None)
+    if csrf_context is None:
+        csrf_context = {
+            "csrf_token": get_csrf_token(request),
+            "csrf_token_field": csrf_token_field(request),
+            "csrf_token_meta": csrf_token_meta(request),
+        }
+        request.state.csrf_context = csrf_context
+
+    # Update in place - callers pass per-render dicts, so no copy needed
+    context.update(csrf_context)
+    return context
 
 
 class TemplateResponse:
@@ -23,6 +42,9 @@ class TemplateResponse:
 
     def __init__(self, directory: str):
         self.templates = Jinja2Templates(directory=directory)
+        self.templates.env.bytecode_cache = _BYTECODE_CACHE
+        # Skip per-render mtime stat calls outside of development
+        self.templates.env.auto_reload = settings.TEMPLATES_AUTO_RELOAD
 
     def __call__(self, request: Request, name: str, context: dict = None, **kwargs):
         """Render template with CSRF context automatically added"""
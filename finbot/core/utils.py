@@ -1,10 +1,41 @@
 """Core utils"""
 
 import re
+from functools import lru_cache
 
 from finbot.config import settings
 
+# Single precompiled alternation covering the explicit browser tokens; one
+# engine pass replaces the sequential re.search calls per request. The
+# matched named group identifies the browser family and captures the major
+# version. Leftmost-match order agrees with the original pattern priority
+# for these tokens because none of them appears before a higher-priority
+# token in real UA strings.
+_UA_RE = re.compile(
+    r"Chrome/(?P<Chrome>\d+)"
+    r"|Chromium/(?P<Chromium>\d+)"
+    r"|Firefox/(?P<Firefox>\d+)"
+    r"|Edge?/(?P<Edge>\d+)"
+    r"|(?:OPR|Opera)/(?P<Opera>\d+)"
+    r"|MSIE (?P<IE>\d+)"
+    r"|Trident.*rv:(?P<Trident>\d+)",
+    re.IGNORECASE,
+)
 
+# Safari is deliberately kept out of the alternation: Android WebView UAs
+# read "Version/4.0 Chrome/115 ... Safari", where "Version/...Safari"
+# starts at an earlier offset than "Chrome/" and leftmost-match would beat
+# Chrome's priority. It is only tried once the alternation misses.
+_UA_SAFARI_RE = re.compile(r"Version/(?P<Safari>\d+).*Safari", re.IGNORECASE)
+
+# Groups that normalize to a different family name than the group itself
+_UA_FAMILY_ALIASES = {"Trident": "IE"}
+
+# Fallback: extract first version-looking number
+_UA_FALLBACK_RE = re.compile(r"/(\d+)")
+
+
+@lru_cache(maxsize=4096)
 def normalize_user_agent(user_agent: str | None) -> str:
     """
     Normalize user agent to extract stable browser family and major version.
@@ -19,40 +50,20 @@ def normalize_user_agent(user_agent: str | None) -> str:
     if not user_agent:
         return "unknown/0"
 
-    # Common browser patterns with major version extraction
-    patterns = [
-        # Chrome/Chromium (must come before Safari due to Chrome containing Safari)
-        (r"Chrome/(\d+)", "Chrome"),
-        (r"Chromium/(\d+)", "Chromium"),
-        # Firefox
-        (r"Firefox/(\d+)", "Firefox"),
-        # Safari (must come after Chrome check)
-        (r"Version/(\d+).*Safari", "Safari"),
-        # Edge
-        (r"Edg/(\d+)", "Edge"),
-        (r"Edge/(\d+)", "Edge"),
-        # Opera
-        (r"OPR/(\d+)", "Opera"),
-        (r"Opera/(\d+)", "Opera"),
-        # Internet Explorer
-        (r"MSIE (\d+)", "IE"),
-        (r"Trident.*rv:(\d+)", "IE"),
-    ]
-
-    for pattern, browser_name in patterns:
-        match = re.search(pattern, user_agent, re.IGNORECASE)
-        if match:
-            major_version = match.group(1)
-            return f"{browser_name}/{major_version}"
-
-    # Fallback: extract first number found or return generic
-    version_match = re.search(r"/(\d+)", user_agent)
+    match = _UA_RE.search(user_agent) or _UA_SAFARI_RE.search(user_agent)
+    if match:
+        group = match.lastgroup
+        family = _UA_FAMILY_ALIASES.get(group, group)
+        return f"{family}/{match.group(group)}"
+
+    version_match = _UA_FALLBACK_RE.search(user_agent)
     if version_match:
         return f"Unknown/{version_match.group(1)}"
 
     return "Unknown/0"
 
 
+@lru_cache(maxsize=4096)
 def create_fingerprint_data(
     user_agent: str | None = None,
     accept_language: str | None = None,
@@ -61,6 +72,8 @@ def create_fingerprint_data(
 ) -> str:
     """
     Create fingerprint data with different validation tiers.
+    Header values repeat massively across requests from the same client,
+    so results are memoized; SECRET_KEY is constant for the process.
 
     Args:
         user_agent: User agent string
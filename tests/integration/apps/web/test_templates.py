@@ -4,44 +4,63 @@ Integration tests for template rendering.
 Tests that templates exist and render correctly.
 """
 
-from pathlib import Path
+import mimetypes
+import re
 
 import pytest
 from fastapi.testclient import TestClient
 
+# Asserted roots as plain strings - they key template_tree and join
+# without pathlib allocations
+STATIC_DIR = "finbot/static"
+BASE_CSS = f"{STATIC_DIR}/css/common/base.css"
+
+# Anchored HTML sniff, compiled once instead of two substring scans per
+# rendered page
+_HTML_RE = re.compile(r"<(?:!DOCTYPE|html)", re.IGNORECASE)
+
+# Required files per directory class - one subset assertion each instead
+# of a pytest item (collection, setup, report) per file
+REQUIRED_TEMPLATES = frozenset(
+    {
+        "base.html",
+        "pages/home.html",
+        "pages/about.html",
+        "pages/contact.html",
+        "components/header.html",
+        "components/footer.html",
+        "components/ctf_footer.html",
+    }
+)
+REQUIRED_STATIC = frozenset(
+    {
+        "css/common/base.css",
+        "js/web/main.js",
+        "images/common/favicon.ico",
+    }
+)
+REQUIRED_ERROR_PAGES = frozenset(
+    f"pages/error/{status}.html" for status in (400, 403, 404, 500, 503)
+)
+
 
 @pytest.mark.integration
 @pytest.mark.web
 class TestTemplateRendering:
     """Test template files and rendering."""
 
-    def test_templates_exist(self):
-        """Test that required template files exist."""
-        template_dir = Path("finbot/apps/web/templates")
-
-        # Base template
-        assert (template_dir / "base.html").exists()
-
-        # Page templates
-        pages = ["home.html", "about.html", "contact.html"]
-        for page in pages:
-            assert (template_dir / "pages" / page).exists()
+    def test_templates_exist(self, known_templates: frozenset):
+        """Test that required templates are loadable by the app's env."""
+        missing = REQUIRED_TEMPLATES - known_templates
+        assert not missing, f"missing templates: {sorted(missing)}"
 
-        # Components
-        components = ["header.html", "footer.html", "ctf_footer.html"]
-        for component in components:
-            assert (template_dir / "components" / component).exists()
-
-    def test_pages_render_without_errors(self, integration_client: TestClient):
+    @pytest.mark.parametrize("page", ["/", "/about", "/contact"])
+    def test_pages_render_without_errors(self, get_cached, page: str):
         """Test that pages render without template errors."""
-        pages = ["/", "/about", "/contact"]
-
-        for page in pages:
-            response = integration_client.get(page)
-            assert response.status_code == 200
-            # Basic check that it's HTML
-            content = response.text
-            assert "<html" in content or "<!DOCTYPE" in content
+        status, _, content = get_cached(page)
+        assert status == 200
+        # Basic check that it's HTML
+        assert _HTML_RE.search(content)
 
 
 @pytest.mark.integration
@@ -49,24 +68,44 @@ class TestTemplateRendering:
 class TestStaticFiles:
     """Test static file serving."""
 
-    def test_static_files_exist(self):
+    def test_static_files_exist(self, template_tree: dict):
         """Test that key static files exist."""
-        static_dir = Path("finbot/static")
+        missing = REQUIRED_STATIC - template_tree[STATIC_DIR]
+        assert not missing, f"missing static files: {sorted(missing)}"
 
-        # CSS
-        assert (static_dir / "css" / "common" / "base.css").exists()
+    def test_static_css_readable(self):
+        """Test the CSS bytes directly - no HTTP pipeline needed."""
+        with open(BASE_CSS, "rb") as f:
+            assert f.read(8)
 
-        # JS
-        assert (static_dir / "js" / "web" / "main.js").exists()
-
-        # Images
-        assert (static_dir / "images" / "common" / "favicon.ico").exists()
+    def test_css_mime_mapping(self):
+        """Test the content-type StaticFiles will derive for CSS."""
+        assert mimetypes.guess_type("base.css")[0] == "text/css"
 
     def test_static_files_serve(self, integration_client: TestClient):
-        """Test that static files are served."""
+        """Test that static files are served.
+        - The one representative request that exercises the real
+          StaticFiles mount end to end
+        """
         response = integration_client.get("/static/css/common/base.css")
         assert response.status_code == 200
-        assert "text/css" in response.headers.get("content-type", "")
+        assert response.headers.get("content-type", "").startswith("text/css")
+
+    def test_static_files_conditional_get(self, integration_client: TestClient):
+        """Test that repeat static requests revalidate instead of re-download.
+        - StaticFiles emits an ETag; echoing it back must short-circuit to
+          an empty 304 so cached clients skip the body transfer
+        """
+        first = integration_client.get("/static/css/common/base.css")
+        assert first.status_code == 200
+        etag = first.headers.get("etag")
+        assert etag
+
+        second = integration_client.get(
+            "/static/css/common/base.css", headers={"If-None-Match": etag}
+        )
+        assert second.status_code == 304
+        assert not second.content
 
 
 @pytest.mark.integration
@@ -74,22 +113,11 @@ class TestStaticFiles:
 class TestErrorHandling:
     """Test error page handling."""
 
-    def test_error_pages_exist(self):
-        """Test that error page files exist."""
-        error_dir = Path("finbot/static/pages/error")
-
-        for status in [400, 403, 404, 500, 503]:
-            error_file = error_dir / f"{status}.html"
-            assert error_file.exists()
-
-    def test_web_vs_api_error_responses(self, integration_client: TestClient):
-        """Test that web and API requests get different error responses."""
-        # Web request should get HTML
-        web_response = integration_client.get("/missing-page")
-        assert web_response.status_code == 404
-        assert "text/html" in web_response.headers["content-type"]
-
-        # API request should get JSON
-        api_response = integration_client.get("/api/missing")
-        assert api_response.status_code == 404
-        assert "application/json" in api_response.headers["content-type"]
+    def test_error_pages_exist(self, template_tree: dict):
+        """Test that error page files exist.
+
+        The web-vs-API error content-type split is covered by the
+        response-shape matrix in the unit route tests.
+        """
+        missing = REQUIRED_ERROR_PAGES - template_tree[STATIC_DIR]
+        assert not missing, f"missing error pages: {sorted(missing)}"
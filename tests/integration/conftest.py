@@ -2,10 +2,38 @@
 Integration test configuration.
 """
 
+import os
+
 import pytest
 
+from finbot.apps.web.routes import template_response
+
+
+@pytest.fixture(scope="session")
+def known_templates():
+    """Templates visible to the web app's own Jinja loader.
+
+    Existence checks against this set prove what actually matters - that
+    the app can load the template - and reuse the loader's directory
+    walk instead of probing the filesystem again.
+    """
+    return frozenset(template_response.templates.env.list_templates())
+
+
+@pytest.fixture(scope="session")
+def template_tree():
+    """Relative file paths under each asserted directory.
 
-@pytest.fixture
-def integration_client(client):
-    """Alias for client fixture for integration tests."""
-    return client
+    One walk per root instead of a stat() per asserted file; existence
+    tests become set-membership checks.
+    """
+    roots = ("finbot/apps/web/templates", "finbot/static")
+    tree = {}
+    for root in roots:
+        files = set()
+        for dirpath, _, filenames in os.walk(root):
+            rel = os.path.relpath(dirpath, root)
+            for filename in filenames:
+                files.add(filename if rel == "." else f"{rel}/{filename}")
+        tree[root] = frozenset(files)
+    return tree
@@ -7,43 +7,33 @@ Simple, focused tests for the core web functionality.
 import pytest
 from fastapi.testclient import TestClient
 
+# Expected (status, content-type prefix) for every public URL, asserted
+# by one matrix test; get_cached dedupes requests shared with other tests
+CASES = [
+    ("/", 200, "text/html"),
+    ("/about", 200, "text/html"),
+    ("/contact", 200, "text/html"),
+    ("/work", 200, "text/html"),
+    ("/partners", 200, "text/html"),
+    ("/careers", 200, "text/html"),
+    ("/does-not-exist", 404, "text/html"),
+    ("/api/missing", 404, "application/json"),
+]
+
 
 @pytest.mark.unit
 @pytest.mark.web
 class TestWebRoutes:
     """Test web page routes."""
 
-    def test_home_page(self, fast_client: TestClient):
-        """Test home page loads."""
-        response = fast_client.get("/")
-        assert response.status_code == 200
-        assert "text/html" in response.headers["content-type"]
-
-    def test_about_page(self, fast_client: TestClient):
-        """Test about page loads."""
-        response = fast_client.get("/about")
-        assert response.status_code == 200
-        assert "text/html" in response.headers["content-type"]
-
-    def test_contact_page(self, fast_client: TestClient):
-        """Test contact page loads."""
-        response = fast_client.get("/contact")
-        assert response.status_code == 200
-        assert "text/html" in response.headers["content-type"]
-
     @pytest.mark.parametrize(
-        "path", ["/", "/about", "/work", "/partners", "/careers", "/contact"]
+        "path,status,ctype", CASES, ids=[case[0] for case in CASES]
     )
-    def test_all_pages_load(self, fast_client: TestClient, path: str):
-        """Test all main pages load successfully."""
-        response = fast_client.get(path)
-        assert response.status_code == 200
-        assert "text/html" in response.headers["content-type"]
-
-    def test_404_for_missing_page(self, fast_client: TestClient):
-        """Test 404 for non-existent pages."""
-        response = fast_client.get("/does-not-exist")
-        assert response.status_code == 404
+    def test_response_shape(self, get_cached, path: str, status: int, ctype: str):
+        """Test status and content-type for each public URL."""
+        actual_status, content_type, _ = get_cached(path)
+        assert actual_status == status
+        assert content_type.startswith(ctype)
 
 
 @pytest.mark.unit
@@ -73,12 +63,12 @@ class TestErrorRoutes:
 class TestCriticalFunctionality:
     """Smoke tests for critical functionality."""
 
-    def test_app_starts(self, fast_client: TestClient):
+    def test_app_starts(self, get_cached):
         """Critical: App must start and serve pages."""
-        response = fast_client.get("/")
-        assert response.status_code == 200
+        status, _, _ = get_cached("/")
+        assert status == 200
 
-    def test_error_handling_works(self, fast_client: TestClient):
+    def test_error_handling_works(self, get_cached):
         """Critical: Error handling must work."""
-        response = fast_client.get("/missing")
-        assert response.status_code == 404
+        status, _, _ = get_cached("/missing")
+        assert status == 404
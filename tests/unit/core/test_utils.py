@@ -0,0 +1,54 @@
+"""
+Unit tests for user-agent normalization.
+
+Pins the browser-family mapping so regex refactors can't silently shift
+fingerprints for deployed sessions.
+"""
+
+import pytest
+
+from finbot.core.utils import normalize_user_agent
+
+# (user agent, expected family/major) - the WebView case is the trap:
+# "Version/...Safari" starts before "Chrome/" but Chrome must win
+UA_CASES = [
+    (
+        "Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko)"
+        " Version/4.0 Chrome/115.0.0.0 Mobile Safari/537.36",
+        "Chrome/115",
+    ),
+    (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        " (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+        "Chrome/120",
+    ),
+    (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15"
+        " (KHTML, like Gecko) Version/16.1 Safari/605.1.15",
+        "Safari/16",
+    ),
+    (
+        "Mozilla/5.0 (X11; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/119.0",
+        "Firefox/119",
+    ),
+    (
+        "Mozilla/5.0 (Windows NT 10.0; Trident/7.0; rv:11.0) like Gecko",
+        "IE/11",
+    ),
+    ("curl/8.4.0", "Unknown/8"),
+    ("totally-unknown-agent", "Unknown/0"),
+    ("", "unknown/0"),
+    (None, "unknown/0"),
+]
+
+
+@pytest.mark.unit
+class TestNormalizeUserAgent:
+    """Test browser family/major-version extraction."""
+
+    @pytest.mark.parametrize(
+        "user_agent,expected", UA_CASES, ids=[case[1] for case in UA_CASES]
+    )
+    def test_normalizes_known_families(self, user_agent: str | None, expected: str):
+        """Test that each UA shape maps to its stable family token."""
+        assert normalize_user_agent(user_agent) == expected